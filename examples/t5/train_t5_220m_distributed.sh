@@ -52,6 +52,10 @@ T5_ARGS="
     --tensor-model-parallel-size 1 \
     --pipeline-model-parallel-size 1 \
     --attention-backend auto \
+    --use-distributed-optimizer \
+    --overlap-grad-reduce \
+    --overlap-param-gather \
+    --cross-entropy-loss-fusion \
 "
 
 DATA_ARGS="
@@ -59,6 +63,8 @@ DATA_ARGS="
     --vocab-file $VOCAB_FILE \
     --tokenizer-type BertWordPieceCase \
     --split 99982,9,9 \
+    --num-workers 4 \
+    --dataloader-prefetch-factor 4 \
 "
 
 OUTPUT_ARGS="
@@ -3,7 +3,8 @@
 import os
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+from functools import partial
+from typing import Callable, Dict, List, Optional, Union
 
 import numpy
 import torch
@@ -107,23 +108,139 @@ class T5MaskedWordPieceDataset(MaskedWordPieceDataset):
         Returns:
             torch.tensor: The 4-D attention mask (bs, 1, q_len, kv_len)
         """
-        batch_size = source_block.shape[0]
-        attention_mask = []
-        for i in range(batch_size):
-            source_sample = source_block[i]
-            target_sample = target_block[i]
-            mask = (target_sample[None, :] >= 1) * (source_sample[:, None] >= 1)
-            if make_history_mask:
-                arange = numpy.arange(source_sample.shape[0])
-                history_mask = arange[None,] <= arange[:, None]
-                history_mask = torch.tensor(history_mask).to(mask.device)
-                mask = mask * history_mask
-            mask = ~(mask)  # flip True to False
-            attention_mask.append(mask)
-        attention_mask = torch.stack(attention_mask)
+        # Build the whole batch with broadcasting rather than per sample, so the
+        # number of kernel launches does not grow with the batch size
+        mask = (target_block[:, None, :] >= 1) & (source_block[:, :, None] >= 1)
+        if make_history_mask:
+            q_len = source_block.shape[1]
+            history_mask = torch.ones((q_len, q_len), dtype=torch.bool, device=mask.device).tril()
+            mask = mask & history_mask
+        attention_mask = ~(mask)  # flip True to False
         attention_mask = attention_mask.unsqueeze(1)
         return attention_mask
 
+    @staticmethod
+    def _config_attention_mask_local(
+        encoder_tokens: torch.tensor,
+        decoder_tokens: torch.tensor,
+        encoder_mask: torch.tensor,
+        decoder_mask: torch.tensor,
+    ) -> torch.tensor:
+        """Config attention-mask for the local transformer implementation
+
+        See config_attention_mask for the arguments and return values.
+        """
+        # Local and transformer_engine backbones use different masks shapes. E.g.:
+        # (local: b1ss - transformer_engine: b11s)
+        encoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
+            encoder_tokens, encoder_tokens
+        )
+        decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
+            decoder_tokens, decoder_tokens, make_history_mask=True
+        )
+        encoder_decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
+            decoder_tokens, encoder_tokens
+        )
+        return encoder_mask, decoder_mask, encoder_decoder_mask
+
+    @staticmethod
+    def _config_attention_mask_te(
+        encoder_tokens: torch.tensor,
+        decoder_tokens: torch.tensor,
+        encoder_mask: torch.tensor,
+        decoder_mask: torch.tensor,
+        use_b1ss_padding_mask: bool = False,
+    ) -> torch.tensor:
+        """Config attention-mask for the transformer_engine transformer implementation
+
+        See config_attention_mask for the other arguments and return values.
+
+        Args:
+            use_b1ss_padding_mask (bool): Whether the padding masks are configured
+                as [bs, 1, q_len, kv_len] instead of [bs, 1, 1, seq_len]
+        """
+        # Process for Flash/Fused
+        encoder_mask = encoder_mask.unsqueeze(1).unsqueeze(1)
+        decoder_mask = decoder_mask.unsqueeze(1).unsqueeze(1)
+        encoder_decoder_mask = (decoder_mask, encoder_mask)
+        # set decoder_mask to None because decoder uses AttnMaskType.causal
+        decoder_mask = None
+
+        if use_b1ss_padding_mask:
+            encoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
+                encoder_tokens, encoder_tokens
+            )
+            encoder_decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
+                decoder_tokens, encoder_tokens
+            )
+        return encoder_mask, decoder_mask, encoder_decoder_mask
+
+    @staticmethod
+    def _te_uses_b1ss_padding_mask(test_te_version: str = None) -> bool:
+        """Whether the transformer_engine padding masks must be configured as
+        [bs, 1, q_len, kv_len], conditioned on TE versions and TE backends
+
+        1. For TE version >= 1.10, across all 3 backends,
+           The padding mask is configued as
+           [bs, 1, 1, seq_len] for self-attention and
+           ([bs, 1, 1, q_len], [bs, 1, 1, kv_len]) for cross-attention
+        2. For TE version >=1.7 and <1.10, when using Non-fused backend,
+           The padding mask is configued as
+           [bs, 1, q_len, kv_len] for both self-attention and for cross-attention
+        3. For TE version <1.7, only support Non-fused backend
+           The padding mask is configued as
+           [bs, 1, q_len, kv_len] for both self-attention and for cross-attention
+
+        Args:
+            test_te_version (str): TE version to use instead of the installed one
+
+        Returns:
+            bool: Whether to use [bs, 1, q_len, kv_len] padding masks
+        """
+        # get TE version, using test TE version if not None
+        if test_te_version is not None:
+            te_version = PkgVersion(test_te_version)
+        else:
+            te_version = get_te_version()
+
+        # Check for older TE version than 1.10, adjust attention mask accordingly
+        flash_attention_enabled = os.getenv("NVTE_FLASH_ATTN") == "1"
+        fused_attention_enabled = os.getenv("NVTE_FUSED_ATTN") == "1"
+        if te_version >= PkgVersion("1.10.0"):
+            return False
+        if te_version < PkgVersion("1.7.0"):
+            assert not flash_attention_enabled and not fused_attention_enabled, (
+                "Flash and fused attention is not supported with transformer "
+                "engine version < 1.7. Set NVTE_FLASH_ATTN=0 and NVTE_FUSED_ATTN=0"
+                "or upgrade transformer engine >= 1.7"
+            )
+        return not (flash_attention_enabled) and not (fused_attention_enabled)
+
+    @staticmethod
+    def get_config_attention_mask_fn(
+        use_local: bool = False, test_te_version: str = None
+    ) -> Callable:
+        """Resolve the attention-mask configuration for the transformer-implementation,
+        TE version and TE backend once, so that it is not re-evaluated on every batch
+
+        Args:
+            use_local (bool): Whether the current T5 model uses local (vs TE)
+                transformer implmentation
+            test_te_version (str): TE version to use instead of the installed one
+
+        Returns:
+            Callable: A function with the signature of config_attention_mask, without
+            the use_local and test_te_version arguments
+        """
+        if use_local:
+            return T5MaskedWordPieceDataset._config_attention_mask_local
+        return partial(
+            T5MaskedWordPieceDataset._config_attention_mask_te,
+            use_b1ss_padding_mask=T5MaskedWordPieceDataset._te_uses_b1ss_padding_mask(
+                test_te_version
+            ),
+        )
+
     @staticmethod
     def config_attention_mask(
         encoder_tokens: torch.tensor,
@@ -151,75 +268,10 @@ class T5MaskedWordPieceDataset(MaskedWordPieceDataset):
             torch.tensor: configured decoder attention mask
             torch.tensor: configured encoder-decoder attention mask
         """
-        # If using local transformer implementation (not transformer_engine):
-        # re-organize all attention masks, because local and transformer_engine
-        # backbones use different masks shapes. E.g.:
-        # (local: b1ss - transformer_engine: b11s)
-        if use_local:
-            encoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                encoder_tokens, encoder_tokens
-            )
-            decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                decoder_tokens, decoder_tokens, make_history_mask=True
-            )
-            encoder_decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                decoder_tokens, encoder_tokens
-            )
-
-        else:
-            # If using transformer_engine transformer implementation:
-            # 1. For TE version >= 1.10, across all 3 backends,
-            #    The padding mask is configued as
-            #    [bs, 1, 1, seq_len] for self-attention and
-            #    ([bs, 1, 1, q_len], [bs, 1, 1, kv_len]) for cross-attention
-            # 2. For TE version >=1.7 and <1.10, when using Non-fused backend,
-            #    The padding mask is configued as
-            #    [bs, 1, q_len, kv_len] for both self-attention and for cross-attention
-            # 3. For TE version <1.7, only support Non-fused backend
-            #    The padding mask is configued as
-            #    [bs, 1, q_len, kv_len] for both self-attention and for cross-attention
-
-            # Process for Flash/Fused
-            encoder_mask = encoder_mask.unsqueeze(1).unsqueeze(1)
-            decoder_mask = decoder_mask.unsqueeze(1).unsqueeze(1)
-            encoder_decoder_mask = (decoder_mask, encoder_mask)
-            # set decoder_mask to None because decoder uses AttnMaskType.causal
-            decoder_mask = None
-
-            # get TE version, using test TE version if not None
-            if test_te_version is not None:
-                te_version = PkgVersion(test_te_version)
-            else:
-                te_version = get_te_version()
-
-            # Check for older TE version than 1.10, adjust attention mask accordingly
-            flash_attention_enabled = os.getenv("NVTE_FLASH_ATTN") == "1"
-            fused_attention_enabled = os.getenv("NVTE_FUSED_ATTN") == "1"
-            if (te_version < PkgVersion("1.10.0")) and (te_version >= PkgVersion("1.7.0")):
-                if not (flash_attention_enabled) and not (fused_attention_enabled):
-                    encoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                        encoder_tokens, encoder_tokens
-                    )
-                    encoder_decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                        decoder_tokens, encoder_tokens
-                    )
-                else:
-                    pass
-            elif te_version < PkgVersion("1.7.0"):
-                if not (flash_attention_enabled) and not (fused_attention_enabled):
-                    encoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                        encoder_tokens, encoder_tokens
-                    )
-                    encoder_decoder_mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
-                        decoder_tokens, encoder_tokens
-                    )
-                else:
-                    assert not flash_attention_enabled and not fused_attention_enabled, (
-                        "Flash and fused attention is not supported with transformer "
-                        "engine version < 1.7. Set NVTE_FLASH_ATTN=0 and NVTE_FUSED_ATTN=0"
-                        "or upgrade transformer engine >= 1.7"
-                    )
-        return encoder_mask, decoder_mask, encoder_decoder_mask
+        config_attention_mask_fn = T5MaskedWordPieceDataset.get_config_attention_mask_fn(
+            use_local, test_te_version
+        )
+        return config_attention_mask_fn(encoder_tokens, decoder_tokens, encoder_mask, decoder_mask)
 
     def __getitem__(self, idx: int) -> Dict[str, Union[int, numpy.ndarray]]:
         """Abstract method implementation
@@ -284,27 +336,31 @@ class T5MaskedWordPieceDataset(MaskedWordPieceDataset):
         assert length_pads_encoder >= 0
         assert length_pads_decoder >= 0
 
-        encoder_input = numpy.array(encoder_input, dtype=numpy.int64)
+        encoder_input = numpy.array(encoder_input, dtype=numpy.int32)
         encoder_input = numpy.pad(
             encoder_input, (0, length_pads_encoder), constant_values=self.config.tokenizer.pad
         )
 
-        decoder_input = numpy.array(decoder_input, dtype=numpy.int64)
+        decoder_input = numpy.array(decoder_input, dtype=numpy.int32)
         decoder_input = numpy.pad(
             decoder_input, (0, length_pads_decoder), constant_values=self.config.tokenizer.pad
         )
 
         # Create attention and history masks
-        mask_encoder = numpy.array([1] * length_toks_encoder + [0] * length_pads_encoder)
-        mask_decoder = numpy.array([1] * length_toks_decoder + [0] * length_pads_decoder)
+        mask_encoder = numpy.array(
+            [1] * length_toks_encoder + [0] * length_pads_encoder, dtype=numpy.uint8
+        )
+        mask_decoder = numpy.array(
+            [1] * length_toks_decoder + [0] * length_pads_decoder, dtype=numpy.uint8
+        )
         mask_encoder_decoder = None
 
         # Mask the labels
-        decoder_output = numpy.array(decoder_output, dtype=numpy.int64)
+        decoder_output = numpy.array(decoder_output, dtype=numpy.int32)
         decoder_output = numpy.pad(decoder_output, (0, length_pads_decoder), constant_values=-1)
 
         # Get the loss mask
-        loss_mask = numpy.zeros(self.config.sequence_length_decoder, dtype=numpy.int64)
+        loss_mask = numpy.zeros(self.config.sequence_length_decoder, dtype=numpy.uint8)
         loss_mask[:length_toks_decoder] = 1
 
         return {
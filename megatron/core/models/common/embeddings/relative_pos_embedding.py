@@ -43,6 +43,11 @@ class RelativePositionEmbedding(nn.Module):
         )
         init_method(self.relative_attention_bias.weight)
 
+        # The bucket indices only depend on the sequence lengths, so the ones for
+        # the most recent (query_length, key_length, device) are reused across steps
+        self._cached_bucket_key = None
+        self._cached_relative_position_bucket = None
+
     def _relative_position_bucket(
         self, relative_position, bidirectional=True, num_buckets=32, max_distance=128
     ):
@@ -97,6 +102,33 @@ class RelativePositionEmbedding(nn.Module):
         relative_buckets += torch.where(is_small, relative_position, relative_position_if_large)
         return relative_buckets
 
+    def _get_relative_position_bucket(self, query_length, key_length, device):
+        """Get the relative position buckets for the given sequence lengths, reusing
+        the ones from the previous call when the lengths and device are unchanged.
+
+        Args:
+            query_length (int): The length of the query sequence
+            key_length (int): The length of the key sequence
+            device (torch.device): The device of the relative attention bias
+
+        Returns:
+            torch.Tensor: The bucket indices, with shape (query_length, key_length).
+        """
+        cache_key = (query_length, key_length, device)
+        if self._cached_bucket_key != cache_key:
+            context_position = torch.arange(query_length, dtype=torch.long, device=device)[:, None]
+            memory_position = torch.arange(key_length, dtype=torch.long, device=device)[None, :]
+
+            relative_position = memory_position - context_position
+            self._cached_relative_position_bucket = self._relative_position_bucket(
+                relative_position,  # shape (query_length, key_length)
+                bidirectional=self.bidirectional,
+                num_buckets=self.relative_attention_num_buckets,
+                max_distance=self.relative_attention_max_distance,
+            )
+            self._cached_bucket_key = cache_key
+        return self._cached_relative_position_bucket
+
     def _compute_bias(self, query_length, key_length):
         """
         Adapted from HuggingFace T5 Model
@@ -116,16 +148,9 @@ class RelativePositionEmbedding(nn.Module):
             (1, num_heads, query_length, key_length).
         """
         device = self.relative_attention_bias.weight.device
-        context_position = torch.arange(query_length, dtype=torch.long, device=device)[:, None]
-        memory_position = torch.arange(key_length, dtype=torch.long, device=device)[None, :]
-
-        relative_position = memory_position - context_position  # shape(query_length,key_length)
-        relative_position_bucket = self._relative_position_bucket(
-            relative_position,  # shape (query_length, key_length)
-            bidirectional=self.bidirectional,
-            num_buckets=self.relative_attention_num_buckets,
-            max_distance=self.relative_attention_max_distance,
-        )
+        relative_position_bucket = self._get_relative_position_bucket(
+            query_length, key_length, device
+        )  # shape (query_length, key_length)
         values = self.relative_attention_bias(
             relative_position_bucket
         )  # shape(query_length,key_length,num_heads)
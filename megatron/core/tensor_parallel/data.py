@@ -1,5 +1,7 @@
 # Copyright (c) 2022, NVIDIA CORPORATION. All rights reserved.
 
+from functools import lru_cache
+
 import torch
 
 from megatron.core.utils import get_tensor_model_parallel_group_if_none
@@ -8,12 +10,29 @@ _MAX_DATA_DIM = 5
 
 
 def _check_data_types(keys, data, target_dtype):
-    """Check that all the keys have the same target data type."""
+    """Check that all the keys have the target data type."""
     for key in keys:
+        key_dtype = target_dtype[key] if isinstance(target_dtype, dict) else target_dtype
         assert (
-            data[key].dtype == target_dtype
+            data[key].dtype == key_dtype
         ), '{} has data type {} which ' 'is different than {}'.format(
-            key, data[key].dtype, target_dtype
+            key, data[key].dtype, key_dtype
+        )
+
+
+@lru_cache(maxsize=None)
+def _element_size(dtype):
+    """Size in bytes of one element of the data type."""
+    return torch.empty((), dtype=dtype).element_size()
+
+
+def _check_data_sizes(keys, data, key_size):
+    """Check that all the keys have the expected sizes."""
+    for key in keys:
+        assert data[key].size() == torch.Size(
+            key_size[key]
+        ), '{} has size {} which ' 'is different than {}'.format(
+            key, tuple(data[key].size()), tuple(key_size[key])
         )
 
 
@@ -61,7 +80,21 @@ def _build_key_size_numel_dictionaries(keys, data, tp_group=None):
     return key_size, key_numel, total_numel
 
 
-def broadcast_data(keys, data, datatype, tp_group=None):
+def _build_key_numel_dictionary(keys, key_size):
+    """Build the (key, number of elements) dictionary from known sizes."""
+    key_numel = {}
+    total_numel = 0
+    for key in keys:
+        numel = 1
+        for s in key_size[key]:
+            numel *= s
+        key_numel[key] = numel
+        total_numel += numel
+
+    return key_numel, total_numel
+
+
+def broadcast_data(keys, data, datatype, tp_group=None, key_size=None):
     """Broadcast data from rank zero of each model parallel group to the
     members of the same model parallel group.
 
@@ -69,21 +102,55 @@ def broadcast_data(keys, data, datatype, tp_group=None):
         keys: list of keys in the data disctionary to be broadcasted
         data: data dictionary of string keys and cpu tensor values.
         datatype: torch data type of all tensors in data associated
-                  with keys.
+                  with keys, or dictionary of the data type of each key.
         tp_group: the tensor model parallel group to broadcast to.
+        key_size: optional dictionary of the sizes of the tensors associated
+                  with keys. When the sizes are known on all ranks, this skips
+                  the size broadcast and its device-to-host synchronization.
     """
+    tp_group = get_tensor_model_parallel_group_if_none(tp_group)
     # Build (key, size) and (key, number of elements) dictionaries along
     # with the total number of elements on all ranks.
-    key_size, key_numel, total_numel = _build_key_size_numel_dictionaries(keys, data)
-    tp_group = get_tensor_model_parallel_group_if_none(tp_group)
+    sizes_known = key_size is not None
+    if sizes_known:
+        key_numel, _ = _build_key_numel_dictionary(keys, key_size)
+    else:
+        key_size, key_numel, _ = _build_key_size_numel_dictionaries(keys, data, tp_group)
+
+    # Tensors of different data types are packed as bytes into a single buffer,
+    # largest elements first so that every tensor stays aligned to its element size.
+    key_datatype = datatype if isinstance(datatype, dict) else {key: datatype for key in keys}
+    if len(set(key_datatype[key] for key in keys)) > 1:
+        buffer_datatype = torch.uint8
+        keys = sorted(keys, key=lambda key: -_element_size(key_datatype[key]))
+    else:
+        buffer_datatype = key_datatype[keys[0]]
+    buffer_element_size = _element_size(buffer_datatype)
+    key_buffer_numel = {
+        key: int(key_numel[key]) * _element_size(key_datatype[key]) // buffer_element_size
+        for key in keys
+    }
+    total_buffer_numel = sum(key_buffer_numel.values())
+
     # Pack on rank zero.
     if tp_group.rank() == 0:
-        # Check that all keys have the same data type.
-        _check_data_types(keys, data, datatype)
-        # Flatten the data associated with the keys
-        flatten_data = torch.cat([data[key].cuda().contiguous().view(-1) for key in keys], dim=0)
+        # Check that all keys have the expected data type.
+        _check_data_types(keys, data, key_datatype)
+        if sizes_known:
+            _check_data_sizes(keys, data, key_size)
+        # Flatten the data associated with the keys. The host-to-device copies are
+        # asynchronous when the data loader hands out pinned memory.
+        flatten_data = torch.cat(
+            [
+                data[key].cuda(non_blocking=True).contiguous().view(-1).view(buffer_datatype)
+                for key in keys
+            ],
+            dim=0,
+        )
     else:
-        flatten_data = torch.empty(total_numel, device=torch.cuda.current_device(), dtype=datatype)
+        flatten_data = torch.empty(
+            total_buffer_numel, device=torch.cuda.current_device(), dtype=buffer_datatype
+        )
 
     # Broadcast
     group_ranks = torch.distributed.get_process_group_ranks(group=tp_group)
@@ -94,8 +161,8 @@ def broadcast_data(keys, data, datatype, tp_group=None):
     offset = 0
     for key in keys:
         size = key_size[key]
-        numel = key_numel[key]
-        output[key] = flatten_data.narrow(0, offset, numel).view(size)
+        numel = key_buffer_numel[key]
+        output[key] = flatten_data.narrow(0, offset, numel).view(key_datatype[key]).view(size)
         offset += numel
 
     return output
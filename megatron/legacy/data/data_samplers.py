@@ -43,12 +43,18 @@ def build_pretraining_data_loader(dataset, consumed_samples):
         raise Exception('{} dataloader type is not supported.'.format(
                 args.dataloader_type))
 
+    # Prefetching is only valid with worker processes.
+    extra_kwargs = {}
+    if args.num_workers > 0 and args.dataloader_prefetch_factor is not None:
+        extra_kwargs['prefetch_factor'] = args.dataloader_prefetch_factor
+
     # Torch dataloader.
     return torch.utils.data.DataLoader(dataset,
                                        batch_sampler=batch_sampler,
                                        num_workers=args.num_workers,
                                        pin_memory=True,
                                        persistent_workers=True if args.num_workers > 0 else False,
+                                       **extra_kwargs,
                                        )
 
 class MegatronPretrainingSampler:
@@ -2507,6 +2507,10 @@ def _add_data_args(parser):
                        help='Probability of producing a short sequence.')
     group.add_argument('--num-workers', type=int, default=2,
                        help="Dataloader number of workers.")
+    group.add_argument('--dataloader-prefetch-factor', type=int, default=None,
+                       help='Number of batches loaded in advance by each dataloader '
+                       'worker. Only used when --num-workers > 0. Defaults to the '
+                       'PyTorch default.')
     group.add_argument('--reset-position-ids', action='store_true',
                        help='Reset posistion ids after end-of-document token.')
     group.add_argument('--reset-attention-mask', action='store_true',
@@ -2,8 +2,8 @@
 
 """Pretrain T5"""
 
-from copy import deepcopy
-from functools import partial
+import dataclasses
+from functools import lru_cache, partial
 from typing import Union
 
 import torch
@@ -63,6 +63,18 @@ to accumulate the encoder_hidden_state gradient across skip connections
 """
 
 
+# The block specs only depend on the number of layers, so they are built once and
+# reused by later model_provider calls. The cached specs are shared; do not mutate them.
+_get_t5_encoder_local_block_spec = lru_cache(maxsize=8)(get_t5_encoder_with_local_block_spec)
+_get_t5_decoder_local_block_spec = lru_cache(maxsize=8)(get_t5_decoder_with_local_block_spec)
+_get_t5_encoder_te_block_spec = lru_cache(maxsize=8)(
+    get_t5_encoder_with_transformer_engine_block_spec
+)
+_get_t5_decoder_te_block_spec = lru_cache(maxsize=8)(
+    get_t5_decoder_with_transformer_engine_block_spec
+)
+
+
 def model_provider(
     pre_process=True, post_process=True, add_encoder=True, add_decoder=True
 ) -> Union[megatron.legacy.model.T5Model, T5Model]:
@@ -93,27 +105,40 @@ def model_provider(
             add_decoder=add_decoder,
         )
     else:
-        encoder_config = deepcopy(config)
-        encoder_config.num_layers = args.encoder_num_layers
-
         if args.pipeline_model_parallel_size > 1:
             raise ValueError("Pipeline parallelism is not supported for T5.")
 
+        # FP8 GEMMs only exist in the TE layers; the local spec would silently
+        # train in the higher-precision params_dtype instead.
+        if args.fp8 is not None and args.transformer_impl != "transformer_engine":
+            raise ValueError("FP8 training of T5 requires --transformer-impl transformer_engine.")
+
+        # Shallow copy: the encoder shares every field of the decoder config except
+        # num_layers, and __post_init__ re-validates the encoder layer count.
+        encoder_config = dataclasses.replace(config, num_layers=args.encoder_num_layers)
+
         encoder_layers_per_pipeline = (
             encoder_config.num_layers // encoder_config.pipeline_model_parallel_size
         )
         decoder_layers_per_pipeline = config.num_layers // config.pipeline_model_parallel_size
 
+        # Only build the block specs of the stacks this rank owns.
+        en_block_spec = None
+        de_block_spec = None
         if args.transformer_impl == "local":
-            en_block_spec = get_t5_encoder_with_local_block_spec(encoder_layers_per_pipeline)
-            de_block_spec = get_t5_decoder_with_local_block_spec(decoder_layers_per_pipeline)
+            if add_encoder:
+                en_block_spec = _get_t5_encoder_local_block_spec(encoder_layers_per_pipeline)
+            if add_decoder:
+                de_block_spec = _get_t5_decoder_local_block_spec(decoder_layers_per_pipeline)
         elif args.transformer_impl == "transformer_engine":
-            en_block_spec = get_t5_encoder_with_transformer_engine_block_spec(
-                encoder_layers_per_pipeline
-            )
-            de_block_spec = get_t5_decoder_with_transformer_engine_block_spec(
-                decoder_layers_per_pipeline
-            )
+            # The TE specs use TEDotProductAttention. With the default
+            # --attention-backend auto, TE runs a tiled flash or cuDNN fused kernel,
+            # which never stores the S x S scores, whenever the dtype, GPU, head dim
+            # and mask allow it, and falls back to unfused attention otherwise.
+            if add_encoder:
+                en_block_spec = _get_t5_encoder_te_block_spec(encoder_layers_per_pipeline)
+            if add_decoder:
+                de_block_spec = _get_t5_decoder_te_block_spec(decoder_layers_per_pipeline)
 
         print_rank_0('building T5 model ...')
         model = T5Model(
@@ -139,31 +164,84 @@ def model_provider(
     return model
 
 
+@lru_cache(maxsize=None)
+def _get_broadcast_key_size():
+    """Sizes of the tensors broadcast by get_batch.
+
+    The arguments are fixed after initialization, so the key sizes are built once
+    rather than on every step.
+
+    Returns:
+        key_size (dict): The sizes of the broadcast tensors, None if not fixed
+    """
+    args = get_args()
+
+    # T5 samples are padded to fixed encoder/decoder lengths and the samplers drop
+    # the last partial batch, so the sizes are known on all ranks and the per-step
+    # size broadcast (and its device-to-host sync) can be skipped.
+    key_size = None
+    if args.dataloader_type in ('single', 'cyclic'):
+        enc_size = (args.micro_batch_size, args.encoder_seq_length)
+        dec_size = (args.micro_batch_size, args.decoder_seq_length)
+        key_size = {
+            'text_enc': enc_size,
+            'text_dec': dec_size,
+            'labels': dec_size,
+            'loss_mask': dec_size,
+            'enc_mask': enc_size,
+            'dec_mask': dec_size,
+        }
+
+    return key_size
+
+
+@lru_cache(maxsize=None)
+def _get_config_attention_mask_fn(use_local):
+    """The attention mask configuration only depends on transformer-impl, the TE
+    version and the TE backend, which are all fixed once the model is built."""
+    return T5MaskedWordPieceDataset.get_config_attention_mask_fn(use_local)
+
+
 def get_batch(data_iterator, use_local):
     """Build the batch."""
 
+    key_size = _get_broadcast_key_size()
+    config_attention_mask = _get_config_attention_mask_fn(use_local)
+
     keys = ['text_enc', 'text_dec', 'labels', 'loss_mask', 'enc_mask', 'dec_mask']
-    datatype = torch.int64
+    # Token ids fit in int32 and the masks are 0/1, so the dataset emits the
+    # narrowest exact types and they are widened after the broadcast.
+    datatype = {
+        'text_enc': torch.int32,
+        'text_dec': torch.int32,
+        'labels': torch.int32,
+        'loss_mask': torch.uint8,
+        'enc_mask': torch.uint8,
+        'dec_mask': torch.uint8,
+    }
 
     # Broadcast data.
     if data_iterator is not None:
         data = next(data_iterator)
     else:
         data = None
-    data_b = tensor_parallel.broadcast_data(keys, data, datatype)
+    data_b = tensor_parallel.broadcast_data(keys, data, datatype, key_size=key_size)
 
     # Unpack.
     tokens_enc = data_b['text_enc'].long()
     tokens_dec = data_b['text_dec'].long()
     labels = data_b['labels'].long()
+    # loss_func upcasts the loss mask to fp32 before the reduction, so a narrower
+    # type here would only add a cast.
     loss_mask = data_b['loss_mask'].float()
-    enc_mask = data_b['enc_mask'] < 0.5
-    dec_mask = data_b['dec_mask'] < 0.5
+    # True for padding positions
+    enc_mask = data_b['enc_mask'] == 0
+    dec_mask = data_b['dec_mask'] == 0
 
     # Configure attention mask based on different conditions
     # (e.g., transformer-impl, TE versions, TE backends)
-    enc_mask, dec_mask, enc_dec_mask = T5MaskedWordPieceDataset.config_attention_mask(
-        tokens_enc, tokens_dec, enc_mask, dec_mask, use_local
+    enc_mask, dec_mask, enc_dec_mask = config_attention_mask(
+        tokens_enc, tokens_dec, enc_mask, dec_mask
     )
 
     return tokens_enc, tokens_dec, loss_mask, labels, enc_mask, dec_mask, enc_dec_mask
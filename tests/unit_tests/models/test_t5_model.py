@@ -158,6 +158,22 @@ class TestT5ModelAttentionDimensions:
         assert list(decoder_mask.shape) == [self.bs, 1, self.seq_len_dec, self.seq_len_dec]
         assert list(encoder_decoder_mask.shape) == [self.bs, 1, self.seq_len_dec, self.seq_len]
 
+    @pytest.mark.internal
+    def test_build_b1ss_attention_mask(self):
+        source_tokens = torch.tensor([[5, 6, 0], [7, 0, 0]])
+        target_tokens = torch.tensor([[5, 6, 0], [7, 8, 9]])
+
+        mask = T5MaskedWordPieceDataset._build_b1ss_attention_mask(
+            source_tokens, target_tokens, make_history_mask=True
+        )
+
+        assert list(mask.shape) == [2, 1, 3, 3]
+        for i in range(2):
+            for q in range(3):
+                for k in range(3):
+                    attend = source_tokens[i, q] >= 1 and target_tokens[i, k] >= 1 and k <= q
+                    assert bool(mask[i, 0, q, k]) == (not attend)
+
     @pytest.mark.internal
     def test_transformer_engine_version_1_10(self):
         encoder_mask, decoder_mask, encoder_decoder_mask = (
@@ -176,6 +192,31 @@ class TestT5ModelAttentionDimensions:
         assert list(encoder_decoder_mask[0].shape) == [self.bs, 1, 1, self.seq_len_dec]
         assert list(encoder_decoder_mask[1].shape) == [self.bs, 1, 1, self.seq_len]
 
+    @pytest.mark.internal
+    def test_get_config_attention_mask_fn(self):
+        config_attention_mask = T5MaskedWordPieceDataset.get_config_attention_mask_fn(
+            use_local=False, test_te_version="1.10"
+        )
+        encoder_mask, decoder_mask, encoder_decoder_mask = config_attention_mask(
+            self.encoder_tokens, self.decoder_tokens, self.encoder_mask, self.decoder_mask
+        )
+
+        assert list(encoder_mask.shape) == [self.bs, 1, 1, self.seq_len]
+        assert decoder_mask is None
+        assert list(encoder_decoder_mask[0].shape) == [self.bs, 1, 1, self.seq_len_dec]
+        assert list(encoder_decoder_mask[1].shape) == [self.bs, 1, 1, self.seq_len]
+
+        config_attention_mask = T5MaskedWordPieceDataset.get_config_attention_mask_fn(
+            use_local=True
+        )
+        encoder_mask, decoder_mask, encoder_decoder_mask = config_attention_mask(
+            self.encoder_tokens, self.decoder_tokens, self.encoder_mask, self.decoder_mask
+        )
+
+        assert list(encoder_mask.shape) == [self.bs, 1, self.seq_len, self.seq_len]
+        assert list(decoder_mask.shape) == [self.bs, 1, self.seq_len_dec, self.seq_len_dec]
+        assert list(encoder_decoder_mask.shape) == [self.bs, 1, self.seq_len_dec, self.seq_len]
+
     @pytest.mark.internal
     def test_transformer_engine_version_1_7_to_1_10_flashfused_attn(self):
         os.environ['NVTE_FLASH_ATTN'] = '1'
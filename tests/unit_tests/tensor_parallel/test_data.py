@@ -21,3 +21,32 @@ def test_broadcast_data():
     assert torch.equal(actual_output[0], input_data[0])
     assert torch.equal(actual_output[1], input_data[1])
     Utils.destroy_model_parallel()
+
+
+def test_broadcast_data_with_known_sizes():
+    Utils.initialize_model_parallel(2, 4)
+    input_data = {
+        0: torch.ones((8, 8)).cuda() * 0.0,
+        1: torch.ones((4, 16)).cuda() * 1.0,
+    }
+    dtype = torch.float32
+    key_size = {0: (8, 8), 1: (4, 16)}
+    actual_output = broadcast_data([0, 1], input_data, dtype, key_size=key_size)
+    assert torch.equal(actual_output[0], input_data[0])
+    assert torch.equal(actual_output[1], input_data[1])
+    Utils.destroy_model_parallel()
+
+
+def test_broadcast_data_with_mixed_types():
+    Utils.initialize_model_parallel(2, 4)
+    input_data = {
+        0: torch.ones((8, 8), dtype=torch.uint8).cuda(),
+        1: torch.arange(64, dtype=torch.int64).view(8, 8).cuda(),
+        2: torch.ones((8, 8), dtype=torch.bfloat16).cuda() * 2.0,
+    }
+    datatype = {0: torch.uint8, 1: torch.int64, 2: torch.bfloat16}
+    actual_output = broadcast_data([0, 1, 2], input_data, datatype)
+    for key in datatype:
+        assert actual_output[key].dtype == datatype[key]
+        assert torch.equal(actual_output[key], input_data[key])
+    Utils.destroy_model_parallel()
@@ -36,3 +36,18 @@ class TestRelativePositionEmbedding:
         assert output.shape[1] == self.num_heads
         assert output.shape[2] == self.query_seq_length
         assert output.shape[3] == self.query_seq_length
+
+    def test_bucket_cache(self):
+        query_seq_length = 64
+        first = self.relative_pos_emb._get_relative_position_bucket(
+            query_seq_length, query_seq_length, torch.device('cpu')
+        )
+        second = self.relative_pos_emb._get_relative_position_bucket(
+            query_seq_length, query_seq_length, torch.device('cpu')
+        )
+        assert second is first
+
+        other = self.relative_pos_emb._get_relative_position_bucket(
+            query_seq_length, 2 * query_seq_length, torch.device('cpu')
+        )
+        assert list(other.shape) == [query_seq_length, 2 * query_seq_length]